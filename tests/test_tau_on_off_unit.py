@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+单元测试：transient.tau_on_off 提取器（不依赖实际数据）
+
+用已知 tau 的合成指数方波验证 TauOnOffExtractor 的核心路径：
+- extract_single_step 能恢复逐 cycle 的 tau_on / tau_off
+- 退化 step（常值 / 全 NaN / 点数不足）走短路分支返回空结果
+- _aggregate_tau_on_off 按 step 对齐并以 NaN 填充短 step
+- workflow 元数据推导的 period / sample_rate 单位换算（毫秒 → 秒/Hz）
+"""
+
+import sys
+from pathlib import Path
+import numpy as np
+
+# 添加包路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from infra.features_v2.extractors.transient import (
+    TauOnOffExtractor,
+    _derive_workflow_sampling,
+)
+
+PERIOD = 0.25       # 秒
+SAMPLE_RATE = 1000  # Hz
+TAU_ON = 0.020      # 秒
+TAU_OFF = 0.030     # 秒
+
+
+def create_mock_step(
+    n_cycles=10,
+    tau_on=TAU_ON,
+    tau_off=TAU_OFF,
+    i_low=1e-6,
+    i_high=5e-6,
+    noise=0.0,
+):
+    """合成一个 step 的指数方波 transient 数据
+
+    每个周期前半段向高电平指数上升（时间常数 tau_on），
+    后半段向低电平指数衰减（时间常数 tau_off）。
+    """
+    half = int(PERIOD * SAMPLE_RATE / 2)
+    t_half = np.arange(half) / SAMPLE_RATE
+
+    rise = i_high + (i_low - i_high) * np.exp(-t_half / tau_on)
+    fall = i_low + (i_high - i_low) * np.exp(-t_half / tau_off)
+    one_cycle = np.concatenate([rise, fall])
+
+    current = np.tile(one_cycle, n_cycles)
+    if noise > 0:
+        rng = np.random.default_rng(42)
+        current = current + rng.normal(0.0, noise * (i_high - i_low), current.size)
+
+    time = np.arange(current.size) / SAMPLE_RATE
+    return {
+        'continuous_time': time,
+        'original_time': time.copy(),
+        'drain_current': current,
+    }
+
+
+def test_extract_single_step_recovers_tau():
+    """测试 1: 合成方波上恢复已知 tau"""
+    print("=" * 80)
+    print("测试 1: extract_single_step 恢复已知 tau")
+    print("=" * 80)
+
+    extractor = TauOnOffExtractor({})
+    params = {'period': PERIOD, 'sample_rate': SAMPLE_RATE}
+
+    n_cycles = 10
+    step = create_mock_step(n_cycles=n_cycles)
+    result = extractor.extract_single_step(step, params)
+
+    print(f"\n输出形状: {result.shape}")
+    assert result.ndim == 2 and result.shape[1] == 2, \
+        f"应返回 (n_cycles, 2)，实际: {result.shape}"
+    assert result.shape[0] >= n_cycles - 1, \
+        f"cycle 数不应少于 {n_cycles - 1}，实际: {result.shape[0]}"
+
+    tau_on_med = float(np.nanmedian(result[:, 0]))
+    tau_off_med = float(np.nanmedian(result[:, 1]))
+    print(f"tau_on  中位数: {tau_on_med:.6f}s (真值 {TAU_ON}s)")
+    print(f"tau_off 中位数: {tau_off_med:.6f}s (真值 {TAU_OFF}s)")
+
+    valid = np.count_nonzero(np.isfinite(result))
+    assert valid >= result.size * 0.8, \
+        f"有效拟合比例过低: {valid}/{result.size}"
+    assert abs(tau_on_med - TAU_ON) / TAU_ON < 0.2, \
+        f"tau_on 偏差过大: {tau_on_med} vs {TAU_ON}"
+    assert abs(tau_off_med - TAU_OFF) / TAU_OFF < 0.2, \
+        f"tau_off 偏差过大: {tau_off_med} vs {TAU_OFF}"
+
+    print("\n✅ tau 恢复测试通过！")
+
+
+def test_degenerate_step_short_circuit():
+    """测试 2: 退化 step 短路返回空结果"""
+    print("\n" + "=" * 80)
+    print("测试 2: 退化 step 短路分支")
+    print("=" * 80)
+
+    extractor = TauOnOffExtractor({})
+    params = {'period': PERIOD, 'sample_rate': SAMPLE_RATE}
+
+    n = int(PERIOD * SAMPLE_RATE) * 2
+    time = np.arange(n) / SAMPLE_RATE
+
+    scenarios = {
+        '常值信号': np.full(n, 1e-6),
+        '全 NaN 信号': np.full(n, np.nan),
+        '点数不足': np.array([1.0, 2.0, 3.0]),
+    }
+
+    for name, current in scenarios.items():
+        step = {
+            'continuous_time': time[:current.size],
+            'original_time': time[:current.size],
+            'drain_current': current,
+        }
+        result = extractor.extract_single_step(step, params)
+        print(f"\n场景 '{name}': 输出形状 {result.shape}")
+        assert result.shape == (0, 2), \
+            f"退化 step 应返回 (0, 2)，实际: {result.shape}"
+
+    print("\n✅ 退化短路测试通过！")
+
+
+def test_aggregate_alignment():
+    """测试 3: 逐 step 结果对齐与 NaN 填充"""
+    print("\n" + "=" * 80)
+    print("测试 3: _aggregate_tau_on_off 对齐")
+    print("=" * 80)
+
+    extractor = TauOnOffExtractor({})
+
+    r0 = np.array([[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]], dtype=np.float32)
+    r1 = np.array([[7.0, 8.0]], dtype=np.float32)
+    r2 = np.empty((0, 2), dtype=np.float32)
+
+    out = extractor._aggregate_tau_on_off([r0, r1, r2])
+    print(f"\n输出形状: {out.shape}")
+    assert out.shape == (3, 3, 2), f"应为 (3, 3, 2)，实际: {out.shape}"
+
+    assert np.array_equal(out[0], r0), "step 0 数据未按原样写入"
+    assert np.array_equal(out[1, :1], r1), "step 1 数据未按原样写入"
+    assert np.all(np.isnan(out[1, 1:])), "step 1 的尾部应为 NaN 填充"
+    assert np.all(np.isnan(out[2])), "空 step 应整行 NaN"
+
+    # 返回值必须是拷贝：后续 extract() 复用工作缓冲区不应改写已有结果
+    out2 = extractor._aggregate_tau_on_off(
+        [np.full((3, 2), -1.0, dtype=np.float32)]
+    )
+    assert np.array_equal(out[0], r0), \
+        "返回的结果被后续聚合覆盖（返回了缓冲区视图而非拷贝）"
+    assert np.all(out2 == -1.0)
+
+    print("\n✅ 聚合对齐测试通过！")
+
+
+def test_extract_batch_and_validation():
+    """测试 4: extract 整批提取与输入校验"""
+    print("\n" + "=" * 80)
+    print("测试 4: extract 整批提取与输入校验")
+    print("=" * 80)
+
+    extractor = TauOnOffExtractor({})
+    params = {'period': PERIOD, 'sample_rate': SAMPLE_RATE}
+
+    steps = [create_mock_step(n_cycles=6), create_mock_step(n_cycles=3)]
+    result = extractor.extract(steps, params)
+    print(f"\n输出形状: {result.shape}")
+    assert result.ndim == 3 and result.shape[0] == 2 and result.shape[2] == 2, \
+        f"应为 (2, max_cycles, 2)，实际: {result.shape}"
+
+    # 缺字段输入应在 extract 入口被一次性校验拦截
+    try:
+        extractor.extract([{'drain_current': np.zeros(10)}], params)
+        raise AssertionError("缺 continuous_time 的输入应抛出 ValueError")
+    except ValueError as e:
+        print(f"\n✅ 正确拦截非法输入: {e}")
+
+    print("\n✅ 整批提取测试通过！")
+
+
+def test_workflow_sampling_units():
+    """测试 5: workflow 元数据单位换算（毫秒 → 秒/Hz）"""
+    print("\n" + "=" * 80)
+    print("测试 5: workflow 采样参数推导")
+    print("=" * 80)
+
+    workflow = {
+        'workflow_step_1_2_param_topTime': 125,
+        'workflow_step_1_2_param_bottomTime': 125,
+        'workflow_step_1_2_param_timeStep': 1,
+    }
+    period, sample_rate = _derive_workflow_sampling(workflow)
+    print(f"\n推导结果: period={period}s, sample_rate={sample_rate}Hz")
+    assert period == 0.25, f"125ms + 125ms 应推出 0.25s，实际: {period}"
+    assert sample_rate == 1000.0, f"timeStep=1ms 应推出 1000Hz，实际: {sample_rate}"
+
+    # 缺项返回 None，由调用方回退默认值
+    assert _derive_workflow_sampling({}) == (None, None)
+
+    extractor = TauOnOffExtractor({})
+    resolved = extractor._get_sampling_params({'workflow': workflow})
+    assert resolved == (0.25, 1000.0), f"解析结果不符: {resolved}"
+    # 显式参数优先于 workflow 推导
+    resolved = extractor._get_sampling_params(
+        {'workflow': workflow, 'period': 0.5}
+    )
+    assert resolved == (0.5, 1000.0), f"显式 period 应优先: {resolved}"
+
+    print("\n✅ 单位换算测试通过！")
+
+
+if __name__ == '__main__':
+    print("\n" + "🧪 开始单元测试" + "\n")
+
+    test_extract_single_step_recovers_tau()
+    test_degenerate_step_short_circuit()
+    test_aggregate_alignment()
+    test_extract_batch_and_validation()
+    test_workflow_sampling_units()
+
+    print("\n" + "=" * 80)
+    print("🎉 所有单元测试通过！")
+    print("=" * 80)